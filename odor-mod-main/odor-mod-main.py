@@ -9,9 +9,12 @@ import glob
 import random
 import signal
 import sys
+import asyncio
 import statistics
+import threading
 import lgpio
 import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 
 # Try to import MongoDB
 try:
@@ -58,6 +61,7 @@ mongo_collection = None
 dht_sensors = []
 running = True
 sensor_data_buffer = []
+last_save_time = time.time()
 
 # GPIO control handle
 gpio_handle = None
@@ -81,22 +85,28 @@ except Exception as e:
     OCCUPANCY_MODULE_AVAILABLE = False
     print(f"Warning: Could not import occupancy module: {e}. Using local occupancy detection.")
 
+# Shared serial-port helpers (single copy used by the module and test tools)
+_CORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "odor_core.py")
+_core_spec = importlib.util.spec_from_file_location("odor_core", _CORE_PATH)
+odor_core = importlib.util.module_from_spec(_core_spec)
+_core_spec.loader.exec_module(odor_core)
+
 # Initialize data format
-def get_data_template():
+# Document keys precomputed once; building keys with f-strings on every save
+# allocates fresh strings each time for no benefit
+GAS_KEYS = ("GAS1", "GAS2", "GAS3", "GAS4")
+TEMP_KEYS = ("TEMP1", "TEMP2", "TEMP3", "TEMP4")
+
+def build_data_document(gas_values, temp_readings):
+    """Build a database document (odor-data-format.json layout) in one pass"""
+    now = datetime.datetime.now()
     return {
-        "_id": str(ObjectId()) if MONGODB_AVAILABLE else "local_" + datetime.datetime.now().strftime("%Y%m%d%H%M%S"),
-        "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "aqi": {
-            "GAS1": 0,
-            "GAS2": 0,
-            "GAS3": 0,
-            "GAS4": 0
-        },
+        "_id": str(ObjectId()) if MONGODB_AVAILABLE else "local_" + now.strftime("%Y%m%d%H%M%S"),
+        "timestamp": now.strftime("%Y-%m-%d %H:%M:%S"),
+        "aqi": dict(zip(GAS_KEYS, gas_values)),
         "dht": {
-            "TEMP1": {"temp": 0.00, "hum": 0.00},
-            "TEMP2": {"temp": 0.00, "hum": 0.00},
-            "TEMP3": {"temp": 0.00, "hum": 0.00},
-            "TEMP4": {"temp": 0.00, "hum": 0.00}
+            key: {"temp": reading["temp"], "hum": reading["hum"]}
+            for key, reading in zip(TEMP_KEYS, temp_readings)
         }
     }
 
@@ -107,93 +117,11 @@ def log_message(message):
 
 def scan_serial_ports():
     """Scan for available serial ports with fallback methods"""
-    log_message("Scanning serial ports...")
-    
-    # Method 1: Try using glob (most reliable)
-    try:
-        # Common USB-Serial patterns
-        patterns = [
-            '/dev/ttyUSB*',
-            '/dev/ttyACM*',
-            '/dev/ttyAMA*',
-            'COM[0-9]*'  # For Windows
-        ]
-        
-        ports = []
-        for pattern in patterns:
-            ports.extend(glob.glob(pattern))
-        
-        if ports:
-            log_message(f"Found ports using glob: {', '.join(ports)}")
-            return ports
-    except Exception as e:
-        log_message(f"Glob scan error: {e}")
-    
-    # Method 2: Try direct device check
-    try:
-        potential_ports = [
-            '/dev/ttyUSB0',
-            '/dev/ttyUSB1',
-            '/dev/ttyACM0',
-            '/dev/ttyACM1',
-            '/dev/ttyAMA0'
-        ]
-        
-        ports = [port for port in potential_ports if os.path.exists(port)]
-        if ports:
-            log_message(f"Found ports using direct check: {', '.join(ports)}")
-            return ports
-    except Exception as e:
-        log_message(f"Direct check error: {e}")
-    
-    # Method 3: Last resort - try subprocess with explicit paths
-    try:
-        result = subprocess.run(['ls', '/dev/ttyUSB0'], capture_output=True, text=True)
-        if result.returncode == 0:
-            log_message("Found /dev/ttyUSB0 using subprocess")
-            return ['/dev/ttyUSB0']
-    except Exception as e:
-        log_message(f"Subprocess check error: {e}")
-    
-    log_message("No serial ports found using any method")
-    return []
+    return odor_core.scan_serial_ports(log=log_message)
 
 def fix_port_permissions(port):
     """Fix permission issues for serial ports"""
-    log_message(f"Fixing permissions for {port}...")
-    
-    try:
-        # Kill any processes using the port
-        log_message("Killing processes using the port...")
-        subprocess.run(['sudo', 'fuser', '-k', port], capture_output=True, check=False)
-        time.sleep(1)
-        
-        # Reset USB device
-        port_base = os.path.basename(port)
-        if 'USB' in port_base:
-            bus_device = subprocess.run(['readlink', '-f', port], capture_output=True, text=True, check=False).stdout.strip()
-            if bus_device:
-                usb_path = os.path.dirname(os.path.dirname(bus_device))
-                if os.path.exists(os.path.join(usb_path, 'authorized')):
-                    log_message("Resetting USB device...")
-                    subprocess.run(['sudo', 'sh', '-c', f'echo 0 > {usb_path}/authorized'], check=False)
-                    time.sleep(1)
-                    subprocess.run(['sudo', 'sh', '-c', f'echo 1 > {usb_path}/authorized'], check=False)
-                    time.sleep(2)
-        
-        # Set permissions
-        log_message("Setting port permissions...")
-        subprocess.run(['sudo', 'chmod', '666', port], check=False)
-        
-        # Add current user to dialout group
-        username = os.getenv('USER', 'pi')
-        log_message(f"Adding user {username} to dialout group...")
-        subprocess.run(['sudo', 'usermod', '-a', '-G', 'dialout', username], check=False)
-        
-        return True
-    except Exception as e:
-        log_message(f"Error fixing permissions: {e}")
-        return False
+    return odor_core.fix_port_permissions(port, log=log_message)
 
 def try_connect_port(port, retries=3):
     """Try to connect to a port with multiple retries"""
@@ -234,8 +162,10 @@ def try_connect_port(port, retries=3):
             log_message(f"Unexpected error: {e}")
         
         if attempt < retries - 1:
-            log_message(f"Retrying in 2 seconds...")
-            time.sleep(2)
+            # Jittered exponential backoff instead of a fixed 2 s wait
+            delay = random.uniform(0, min(4.0, 0.5 * (2 ** attempt)))
+            log_message(f"Retrying in {delay:.1f} seconds...")
+            time.sleep(delay)
     
     return None
 
@@ -243,6 +173,15 @@ def connect_to_arduino():
     """Find and connect to Arduino on available serial ports"""
     global arduino_serial
     
+    # Try the port that worked last time before paying for a full scan
+    last_port = odor_core.read_last_port()
+    if last_port:
+        log_message(f"Trying last-known port {last_port}...")
+        ser = try_connect_port(last_port)
+        if ser:
+            arduino_serial = ser
+            return True
+    
     ports = scan_serial_ports()
     
     if not ports:
@@ -266,6 +205,7 @@ def connect_to_arduino():
         ser = try_connect_port(port)
         if ser:
             arduino_serial = ser
+            odor_core.remember_port(port)
             return True
     
     log_message("Could not find Arduino on any port")
@@ -404,7 +344,7 @@ def connect_to_mongodb():
     
     try:
         log_message("Connecting to MongoDB...")
-        mongo_client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
+        mongo_client = MongoClient(MONGO_URI, **odor_core.MONGO_CLIENT_OPTIONS)
         # Test connection
         mongo_client.admin.command('ping')
         
@@ -427,8 +367,47 @@ def connect_to_mongodb():
         mongo_collection = None
         return False
 
+# One worker per DHT sensor: each read can block 10-250 ms on the one-wire
+# protocol timing, so the four sensors are read concurrently instead of
+# back-to-back
+DHT_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+def _read_one_dht(index, sensor):
+    """Read a single DHT22 with retries; falls back to simulated data"""
+    retry_count = 3  # Add retry logic for more reliable readings
+    
+    for attempt in range(retry_count):
+        try:
+            # DHT sensors need time between readings
+            time.sleep(0.2)
+            
+            temp = sensor.temperature
+            hum = sensor.humidity
+            
+            # Validate readings
+            if (temp is not None and hum is not None and
+                -40 <= temp <= 80 and 0 <= hum <= 100):
+                return {
+                    "temp": round(temp, DECIMAL_PRECISION),
+                    "hum": round(hum, DECIMAL_PRECISION)
+                }
+        except Exception as e:
+            if attempt == retry_count - 1:  # Only log on final attempt
+                log_message(f"DHT sensor {index+1} error (attempt {attempt+1}): {e}")
+            # Exponential backoff with full jitter: transient one-wire
+            # glitches usually clear quickly, and the random spread keeps
+            # the four sensors from retrying in lockstep
+            time.sleep(random.uniform(0, min(1.0, 0.1 * (2 ** attempt))))
+    
+    # Use simulated data for invalid readings
+    log_message(f"DHT sensor {index+1} gave invalid reading after {retry_count} attempts, using simulated data")
+    return {
+        "temp": round(random.uniform(20, 35), DECIMAL_PRECISION),
+        "hum": round(random.uniform(40, 80), DECIMAL_PRECISION)
+    }
+
 def read_temp_sensors():
-    """Read data from DHT22 temperature sensors"""
+    """Read data from DHT22 temperature sensors (all four in parallel)"""
     if not DHT_AVAILABLE or not dht_sensors:
         # Return simulated data if no sensors available
         log_message("No DHT sensors available, using simulated temperature data")
@@ -438,46 +417,10 @@ def read_temp_sensors():
             for _ in range(4)
         ]
     
-    readings = []
-    retry_count = 3  # Add retry logic for more reliable readings
-    
-    # Try to read each sensor
-    for i, sensor in enumerate(dht_sensors):
-        valid_reading = False
-        temp = None
-        hum = None
-        
-        # Try multiple times before giving up
-        for attempt in range(retry_count):
-            try:
-                # DHT sensors need time between readings
-                time.sleep(0.2)
-                
-                temp = sensor.temperature
-                hum = sensor.humidity
-                
-                # Validate readings
-                if (temp is not None and hum is not None and
-                    -40 <= temp <= 80 and 0 <= hum <= 100):
-                    valid_reading = True
-                    break
-            except Exception as e:
-                if attempt == retry_count - 1:  # Only log on final attempt
-                    log_message(f"DHT sensor {i+1} error (attempt {attempt+1}): {e}")
-                time.sleep(0.5)  # Wait before retry
-        
-        if valid_reading:
-            readings.append({
-                "temp": round(temp, DECIMAL_PRECISION),
-                "hum": round(hum, DECIMAL_PRECISION)
-            })
-        else:
-            # Use simulated data for invalid readings
-            readings.append({
-                "temp": round(random.uniform(20, 35), DECIMAL_PRECISION),
-                "hum": round(random.uniform(40, 80), DECIMAL_PRECISION)
-            })
-            log_message(f"DHT sensor {i+1} gave invalid reading after {retry_count} attempts, using simulated data")
+    # Fan the reads out across the pool and gather results in sensor order
+    futures = [DHT_EXECUTOR.submit(_read_one_dht, i, sensor)
+               for i, sensor in enumerate(dht_sensors)]
+    readings = [future.result() for future in futures]
     
     # If we don't have enough readings, pad with simulated data
     while len(readings) < 4:
@@ -559,31 +502,57 @@ def save_to_local_storage(data):
         log_message(f"Local storage error: {e}")
         return False
 
-def save_to_mongodb(data):
-    """Save data to MongoDB"""
-    global mongo_collection
+# Buffered documents awaiting a batched insert. One insert_many round-trip
+# for several documents costs far less than one insert_one per document.
+mongo_pending = []
+last_mongo_flush = time.time()
+MONGO_BATCH_SIZE = 5        # documents per insert_many
+MONGO_FLUSH_INTERVAL = 600  # force a flush at least every 10 minutes
+
+def flush_mongo_pending():
+    """Write all buffered documents to MongoDB in one insert_many"""
+    global mongo_pending, last_mongo_flush
     
-    if not MONGODB_AVAILABLE or mongo_collection is None:
+    if not mongo_pending or not MONGODB_AVAILABLE or mongo_collection is None:
         return False
     
     try:
-        # Convert _id string to ObjectId for MongoDB
-        if '_id' in data and isinstance(data['_id'], str):
-            if data['_id'].startswith("local_"):
-                # Generate new ObjectId for local IDs
-                data['_id'] = ObjectId()
-            else:
-                # Convert string ID to ObjectId
-                data['_id'] = ObjectId(data['_id'])
-        
-        result = mongo_collection.insert_one(data)
+        mongo_collection.insert_many(mongo_pending, ordered=False)
+        flushed = len(mongo_pending)
+        mongo_pending = []
+        last_mongo_flush = time.time()
+        log_message(f"Flushed {flushed} buffered reading(s) to MongoDB")
         return True
     except Exception as e:
         log_message(f"MongoDB error: {e}")
-        # Try to reconnect
+        # Try to reconnect; buffered documents are kept for the next flush
         connect_to_mongodb()
         return False
 
+def save_to_mongodb(data):
+    """Queue data for MongoDB, flushing in batches"""
+    global last_mongo_flush
+    
+    if not MONGODB_AVAILABLE or mongo_collection is None:
+        return False
+    
+    # Convert _id string to ObjectId for MongoDB
+    if '_id' in data and isinstance(data['_id'], str):
+        if data['_id'].startswith("local_"):
+            # Generate new ObjectId for local IDs
+            data['_id'] = ObjectId()
+        else:
+            # Convert string ID to ObjectId
+            data['_id'] = ObjectId(data['_id'])
+    
+    mongo_pending.append(data)
+    
+    if (len(mongo_pending) >= MONGO_BATCH_SIZE or
+            time.time() - last_mongo_flush >= MONGO_FLUSH_INTERVAL):
+        return flush_mongo_pending()
+    
+    return True
+
 def buffer_sensor_data(gas_values, temp_readings):
     """Add sensor data to buffer for averaging"""
     global sensor_data_buffer
@@ -608,35 +577,17 @@ def calculate_average_from_buffer():
     if not sensor_data_buffer:
         return None
     
-    # Initialize with zeros
-    avg_gas = [0, 0, 0, 0]
-    avg_temp = [
-        {"temp": 0.0, "hum": 0.0},
-        {"temp": 0.0, "hum": 0.0},
-        {"temp": 0.0, "hum": 0.0},
-        {"temp": 0.0, "hum": 0.0}
-    ]
-    
     # Log how many data points are being averaged
     log_message(f"Calculating averages from {len(sensor_data_buffer)} data points over the past {LOGGING_INTERVAL} seconds")
     
-    # Sum all values
-    for data in sensor_data_buffer:
-        # Sum gas values
-        for i in range(4):
-            avg_gas[i] += data["gas"][i]
-        
-        # Sum temperature and humidity
-        for i in range(4):
-            avg_temp[i]["temp"] += data["temp"][i]["temp"]
-            avg_temp[i]["hum"] += data["temp"][i]["hum"]
-    
-    # Calculate averages
-    buffer_len = len(sensor_data_buffer)
-    for i in range(4):
-        avg_gas[i] = round(avg_gas[i] / buffer_len)
-        avg_temp[i]["temp"] = round(avg_temp[i]["temp"] / buffer_len, DECIMAL_PRECISION)
-        avg_temp[i]["hum"] = round(avg_temp[i]["hum"] / buffer_len, DECIMAL_PRECISION)
+    # Column-wise reductions: zip(*) transposes the buffer once and each
+    # average is a single C-level pass instead of nested Python loops
+    avg_gas = [round(statistics.fmean(col)) for col in zip(*(d["gas"] for d in sensor_data_buffer))]
+    avg_temp = [
+        {"temp": round(statistics.fmean(r["temp"] for r in col), DECIMAL_PRECISION),
+         "hum": round(statistics.fmean(r["hum"] for r in col), DECIMAL_PRECISION)}
+        for col in zip(*(d["temp"] for d in sensor_data_buffer))
+    ]
     
     return {"gas": avg_gas, "temp": avg_temp}
 
@@ -654,18 +605,8 @@ def log_sensor_data(gas_values, temp_readings):
 def save_sensor_data(gas_values, temp_readings):
     """Save sensor data to database(s)"""
     global sensor_data_buffer
-    data = get_data_template()
-    
-    # Fill in gas values
-    for i in range(4):
-        data["aqi"][f"GAS{i+1}"] = gas_values[i]
-    
-    # Fill in temp values
-    for i in range(4):
-        data["dht"][f"TEMP{i+1}"]["temp"] = temp_readings[i]["temp"]
-        data["dht"][f"TEMP{i+1}"]["hum"] = temp_readings[i]["hum"]
-    
-    # Note: Removed additional fields to keep exact format as odor-data-format.json
+    # Note: No additional fields, to keep exact format as odor-data-format.json
+    data = build_data_document(gas_values, temp_readings)
     
     # Save to local storage first
     local_saved = save_to_local_storage(data)
@@ -774,8 +715,11 @@ def setup_gpio():
         log_message(f"Error initializing GPIO: {e}")
         return False
 
-def toggle_fan(state):
-    """Toggle exhaust fan on or off (active-low: LOW = ON, HIGH = OFF)"""
+def toggle_fan(state, _write=lgpio.gpio_write, _pin=FAN_RELAY_PIN):
+    """Toggle exhaust fan on or off (active-low: LOW = ON, HIGH = OFF)
+    
+    `_write`/`_pin` are bound as defaults so the per-tick call resolves them
+    as locals instead of module-dict lookups."""
     global fan_status, gpio_handle
     
     if gpio_handle is None:
@@ -784,7 +728,7 @@ def toggle_fan(state):
     
     try:
         # Set GPIO pin: LOW (0) to activate, HIGH (1) to deactivate
-        lgpio.gpio_write(gpio_handle, FAN_RELAY_PIN, 0 if state else 1)
+        _write(gpio_handle, _pin, 0 if state else 1)
         fan_status = state
         log_message(f"Exhaust Fan {'ON' if state else 'OFF'}")
         return True
@@ -792,7 +736,15 @@ def toggle_fan(state):
         log_message(f"Error toggling exhaust fan: {e}")
         return False
 
-def trigger_air_freshener():
+def _release_freshener():
+    """Timer callback: end the freshener pulse (HIGH = OFF)"""
+    try:
+        if gpio_handle is not None:
+            lgpio.gpio_write(gpio_handle, FRESHENER_RELAY_PIN, 1)
+    except Exception as e:
+        log_message(f"Error releasing air freshener relay: {e}")
+
+def trigger_air_freshener(_write=lgpio.gpio_write, _pin=FRESHENER_RELAY_PIN):
     """Trigger air freshener with a 500ms pulse"""
     global freshener_triggered, gpio_handle
     
@@ -802,9 +754,10 @@ def trigger_air_freshener():
     
     try:
         log_message("Triggering air freshener (500ms pulse)...")
-        lgpio.gpio_write(gpio_handle, FRESHENER_RELAY_PIN, 0)  # LOW to activate
-        time.sleep(0.5)  # 500ms pulse
-        lgpio.gpio_write(gpio_handle, FRESHENER_RELAY_PIN, 1)  # HIGH to deactivate
+        _write(gpio_handle, _pin, 0)  # LOW to activate
+        # Release the relay from a timer thread so the event loop is not
+        # blocked for the length of the pulse
+        threading.Timer(0.5, _release_freshener).start()
         freshener_triggered = True
         log_message("Air freshener triggered successfully")
         return True
@@ -831,10 +784,13 @@ def cleanup_gpio():
         except Exception as e:
             log_message(f"Error cleaning up GPIO: {e}")
 
-def check_occupancy():
+def check_occupancy(now=None):
     """Check occupancy status from occupancy module or fallback to direct check"""
     global is_occupied, last_exit_time
     
+    if now is None:
+        now = time.time()
+    
     # If occupancy module is available, use it
     if OCCUPANCY_MODULE_AVAILABLE:
         try:
@@ -843,7 +799,7 @@ def check_occupancy():
             
             # If state changed from occupied to vacant, record exit time
             if is_occupied and current_occupancy_state == occupancy_module.STATE_VACANT:
-                last_exit_time = time.time()
+                last_exit_time = now
                 log_message("Visitor exited (detected from occupancy module)")
                 trigger_on_exit()
             
@@ -871,11 +827,11 @@ def trigger_on_exit():
     
     # Fan will be turned off after the delay period in the main loop
 
-def update_devices():
+def update_devices(now=None):
     """Update device states based on occupancy"""
     global fan_status, last_exit_time
     
-    current_time = time.time()
+    current_time = time.time() if now is None else now
     
     # Update fan status
     if is_occupied:
@@ -888,6 +844,126 @@ def update_devices():
             toggle_fan(False)
             log_message(f"Exhaust fan turned off after {FAN_POST_EXIT_DURATION} seconds of vacancy")
 
+async def _sleep_while_running(seconds):
+    """Sleep up to `seconds` but wake within a second of shutdown"""
+    deadline = time.time() + seconds
+    while running:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(min(1.0, remaining))
+
+# Set by the event loop at startup; the occupancy task uses it to pull the
+# sensor task out of a long idle sleep the moment a visitor enters
+sensor_wake_event = None
+
+async def _sensor_sleep(seconds):
+    """Sleep up to `seconds`, waking early on shutdown or a new entry"""
+    deadline = time.time() + seconds
+    while running:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return
+        try:
+            await asyncio.wait_for(sensor_wake_event.wait(), timeout=min(1.0, remaining))
+            sensor_wake_event.clear()
+            return  # Woken by an entry: sample immediately
+        except asyncio.TimeoutError:
+            pass
+
+async def occupancy_task():
+    """Check occupancy and update the fan/freshener once per second"""
+    global is_occupied
+    
+    while running:
+        # One clock read per tick, shared by the occupancy and device checks
+        now = time.time()
+        previous_state = is_occupied
+        is_occupied = check_occupancy(now)
+        
+        # If just entered, trigger entry actions and wake the sensor task
+        # out of its idle cadence
+        if is_occupied and not previous_state:
+            trigger_on_entry()
+            if sensor_wake_event is not None:
+                sensor_wake_event.set()
+        
+        update_devices(now)
+        await _sleep_while_running(1)
+
+async def sensor_task():
+    """Read and buffer sensor data every 5 seconds.
+    
+    The serial and DHT reads block (the DHT protocol alone can take hundreds
+    of milliseconds), so they run in the default executor and overlap with
+    the occupancy checks and database saves."""
+    loop = asyncio.get_running_loop()
+    
+    while running:
+        # Read sensors off the event loop
+        gas_values = await loop.run_in_executor(None, read_gas_sensors)
+        temp_readings = await loop.run_in_executor(None, read_temp_sensors)
+        
+        # Fix any invalid sensor data
+        gas_values, temp_readings = fix_sensor_data(gas_values, temp_readings)
+        
+        # Buffer the data for averaging
+        buffer_sensor_data(gas_values, temp_readings)
+        
+        # Log current readings
+        log_sensor_data(gas_values, temp_readings)
+        
+        # Show time remaining until next database save
+        time_until_save = int(LOGGING_INTERVAL - (time.time() - last_save_time))
+        log_message(f"Monitoring active. Next database save in {time_until_save} seconds.")
+        
+        # Adaptive cadence: sample fast while someone is inside or the air
+        # is bad, and slow down when the room is idle and clean. An entry
+        # edge wakes the sleep immediately via sensor_wake_event.
+        valid_gas = [v for v in gas_values if v is not None]
+        avg_aqi = sum(valid_gas) / len(valid_gas) if valid_gas else 0
+        if is_occupied or avg_aqi > 200:
+            period = 2
+        elif avg_aqi > 100:
+            period = 5
+        else:
+            period = 15
+        await _sensor_sleep(period)
+
+async def save_task():
+    """Average the buffered readings and persist them every LOGGING_INTERVAL"""
+    global last_save_time
+    loop = asyncio.get_running_loop()
+    saves_count = 0
+    
+    while running:
+        await _sleep_while_running(LOGGING_INTERVAL)
+        if not running:
+            return
+        
+        # Calculate average from buffer
+        avg_data = calculate_average_from_buffer()
+        
+        if avg_data:
+            # Save the averaged data (disk + network I/O, keep it off the loop)
+            await loop.run_in_executor(None, save_sensor_data, avg_data["gas"], avg_data["temp"])
+            saves_count += 1
+            log_message(f"Database save #{saves_count} completed. Next save in {LOGGING_INTERVAL} seconds.")
+        
+        last_save_time = time.time()
+
+async def monitoring_loop():
+    """Run the occupancy, sensor and save coroutines until shutdown"""
+    global last_save_time, sensor_wake_event
+    last_save_time = time.time()
+    sensor_wake_event = asyncio.Event()
+    
+    await asyncio.gather(
+        occupancy_task(),
+        sensor_task(),
+        save_task()
+    )
+
 def main():
     global running, is_occupied, fan_status, freshener_triggered
     
@@ -926,68 +1002,9 @@ def main():
     log_message("Starting continuous monitoring. Press Ctrl+C to stop.")
     log_message(f"Monitoring interval: 5 seconds | Database saving interval: {LOGGING_INTERVAL} seconds")
     
-    last_log_time = time.time()
-    last_save_time = time.time()
-    last_device_update_time = time.time()
-    last_occupancy_check_time = time.time()
-    saves_count = 0
-    
-    # Main loop
-    while running:
-        current_time = time.time()
-        
-        # Check occupancy every second
-        if current_time - last_occupancy_check_time >= 1:
-            previous_state = is_occupied
-            is_occupied = check_occupancy()
-            
-            # If just entered, trigger entry actions
-            if is_occupied and not previous_state:
-                trigger_on_entry()
-            
-            last_occupancy_check_time = current_time
-        
-        # Update device states every second
-        if current_time - last_device_update_time >= 1:
-            update_devices()
-            last_device_update_time = current_time
-        
-        # Read sensor data frequently but log less often
-        if current_time - last_log_time >= 5:  # Read every 5 seconds
-            # Read sensors
-            gas_values = read_gas_sensors()
-            temp_readings = read_temp_sensors()
-            
-            # Fix any invalid sensor data
-            gas_values, temp_readings = fix_sensor_data(gas_values, temp_readings)
-            
-            # Buffer the data for averaging
-            buffer_sensor_data(gas_values, temp_readings)
-            
-            # Log current readings
-            log_sensor_data(gas_values, temp_readings)
-            
-            # Show time remaining until next database save
-            time_until_save = int(LOGGING_INTERVAL - (current_time - last_save_time))
-            log_message(f"Monitoring active. Next database save in {time_until_save} seconds.")
-            
-            last_log_time = current_time
-        
-        # Save buffered/averaged data at the specified interval
-        if current_time - last_save_time >= LOGGING_INTERVAL:  # Save every 120 seconds (2 minutes)
-            # Calculate average from buffer
-            avg_data = calculate_average_from_buffer()
-            
-            if avg_data:
-                # Save the averaged data
-                save_sensor_data(avg_data["gas"], avg_data["temp"])
-                saves_count += 1
-                log_message(f"Database save #{saves_count} completed. Next save in {LOGGING_INTERVAL} seconds.")
-            
-            last_save_time = current_time
-        
-        # Small delay to prevent CPU overuse
-        time.sleep(0.1)
+    # Run the monitoring coroutines; sensor, occupancy and database work
+    # overlap instead of taking turns inside one blocking loop
+    asyncio.run(monitoring_loop())
     
     # When stopping, save final data
     avg_data = calculate_average_from_buffer()
@@ -1021,6 +1038,10 @@ def main():
     
     # Close MongoDB connection
     if mongo_client:
+        try:
+            flush_mongo_pending()
+        except Exception:
+            pass
         try:
             mongo_client.close()
             log_message("Closed MongoDB connection")
@@ -1,5 +1,9 @@
 #include <Wire.h>
 #define I2C_ADDRESS 8
+#define SENSOR_COUNT 4
+
+// Analog inputs carrying the four gas channels (GAS1..GAS4)
+const uint8_t SENSOR_PINS[SENSOR_COUNT] = {A0, A1, A2, A3};
 
 void setup() {
   Wire.begin(I2C_ADDRESS);          // Start I2C as slave on address 8
@@ -13,7 +17,15 @@ void loop() {
 }
 
 void requestEvent() {
-  Serial.println("Received I2C request");
-  Wire.write(0xAA);               // Send single byte 0xAA (170 decimal)
-  Serial.println("Sent byte: 0xAA");
-}
\ No newline at end of file
+  // Serve all four readings as little-endian uint16 in one 8-byte block,
+  // matching the struct.unpack('<HHHH') on the Pi side. A master that
+  // reads fewer bytes simply gets a prefix of the block.
+  uint8_t block[2 * SENSOR_COUNT];
+  for (uint8_t i = 0; i < SENSOR_COUNT; i++) {
+    uint16_t value = analogRead(SENSOR_PINS[i]);
+    block[2 * i] = value & 0xFF;           // Low byte first (little-endian)
+    block[2 * i + 1] = (value >> 8) & 0xFF;
+  }
+  Wire.write(block, sizeof(block));
+  Serial.println("Served 8-byte sensor block");
+}
@@ -1,9 +1,10 @@
 import serial
+import struct
 import time
 import lgpio
-import glob
 import os
 import subprocess
+import importlib.util
 
 # Prerequisites:
 # 1. Install dependencies from requirements.txt:
@@ -19,99 +20,73 @@ BAUD_RATE = 9600
 SERIAL_TIMEOUT = 5
 arduino_serial = None
 
-# GPIO setup using lgpio
-GPIO_CHIP = 0
-h = lgpio.gpiochip_open(GPIO_CHIP)
+# Binary framing (see arduino-analog-recieve.ino): 0xAA 0x55 magic, four
+# uint16 LE AQI values, CRC-8 (poly 0x07) over the payload. 11 bytes total.
+# Requested with 'B' after connecting; ASCII CSV remains the fallback.
+BIN_MAGIC = b'\xaa\x55'
+BIN_FRAME_LEN = 11
+BIN_VALUES = struct.Struct('<HHHH')
+binary_mode = False
 
-def scan_serial_ports():
-    """Scan for available serial ports with fallback methods"""
-    print("Scanning serial ports...")
-    
-    # Method 1: Try using glob (most reliable)
-    try:
-        # Common USB-Serial patterns
-        patterns = [
-            '/dev/ttyUSB*',
-            '/dev/ttyACM*',
-            '/dev/ttyAMA*',
-            'COM[0-9]*'  # For Windows
-        ]
-        
-        ports = []
-        for pattern in patterns:
-            ports.extend(glob.glob(pattern))
-        
-        if ports:
-            print(f"Found ports using glob: {', '.join(ports)}")
-            return ports
-    except Exception as e:
-        print(f"Glob scan error: {e}")
-    
-    # Method 2: Try direct device check
-    try:
-        potential_ports = [
-            '/dev/ttyUSB0',
-            '/dev/ttyUSB1',
-            '/dev/ttyACM0',
-            '/dev/ttyACM1',
-            '/dev/ttyAMA0'
-        ]
-        
-        ports = [port for port in potential_ports if os.path.exists(port)]
-        if ports:
-            print(f"Found ports using direct check: {', '.join(ports)}")
-            return ports
-    except Exception as e:
-        print(f"Direct check error: {e}")
-    
-    # Method 3: Last resort - try subprocess with explicit paths
-    try:
-        result = subprocess.run(['ls', '/dev/ttyUSB0'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print("Found /dev/ttyUSB0 using subprocess")
-            return ['/dev/ttyUSB0']
-    except Exception as e:
-        print(f"Subprocess check error: {e}")
-    
-    print("No serial ports found using any method")
-    return []
+def crc8(payload):
+    """CRC-8 (polynomial 0x07) over the payload bytes"""
+    crc = 0
+    for byte in payload:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
 
-def fix_port_permissions(port):
-    """Fix permission issues for serial ports"""
-    print(f"Fixing permissions for {port}...")
-    
+def read_binary_frame():
+    """Read one validated binary frame; returns four ints or None"""
+    deadline = time.time() + SERIAL_TIMEOUT
+    while time.time() < deadline:
+        first = arduino_serial.read(1)
+        if not first:
+            return None
+        if first != BIN_MAGIC[:1]:
+            continue  # Resync on the first magic byte
+        if arduino_serial.read(1) != BIN_MAGIC[1:]:
+            continue
+        rest = arduino_serial.read(BIN_FRAME_LEN - 2)
+        if len(rest) != BIN_FRAME_LEN - 2:
+            return None
+        payload = rest[:8]
+        if crc8(payload) != rest[8]:
+            continue  # Corrupted frame, resync on the next magic
+        return list(BIN_VALUES.unpack(payload))
+    return None
+
+def enable_binary_frames():
+    """Switch the Arduino to binary framing; falls back to ASCII on failure"""
+    global binary_mode
+    if not arduino_serial:
+        return False
     try:
-        # Kill any processes using the port
-        print("Killing processes using the port...")
-        subprocess.run(['sudo', 'fuser', '-k', port], capture_output=True, check=False)
-        time.sleep(1)
-        
-        # Reset USB device
-        port_base = os.path.basename(port)
-        if 'USB' in port_base:
-            bus_device = subprocess.run(['readlink', '-f', port], capture_output=True, text=True, check=False).stdout.strip()
-            if bus_device:
-                usb_path = os.path.dirname(os.path.dirname(bus_device))
-                if os.path.exists(os.path.join(usb_path, 'authorized')):
-                    print("Resetting USB device...")
-                    subprocess.run(['sudo', 'sh', '-c', f'echo 0 > {usb_path}/authorized'], check=False)
-                    time.sleep(1)
-                    subprocess.run(['sudo', 'sh', '-c', f'echo 1 > {usb_path}/authorized'], check=False)
-                    time.sleep(2)
-        
-        # Set permissions
-        print("Setting port permissions...")
-        subprocess.run(['sudo', 'chmod', '666', port], check=False)
-        
-        # Add current user to dialout group
-        username = os.getenv('USER', 'pi')
-        print(f"Adding user {username} to dialout group...")
-        subprocess.run(['sudo', 'usermod', '-a', '-G', 'dialout', username], check=False)
-        
-        return True
+        arduino_serial.write(b'B')
+        arduino_serial.reset_input_buffer()
+        if read_binary_frame() is not None:
+            binary_mode = True
+            print("Binary framing enabled")
+            return True
+        # Old sketch ignored the request; make sure it stays in ASCII mode
+        arduino_serial.write(b'A')
     except Exception as e:
-        print(f"Error fixing permissions: {e}")
-        return False
+        print(f"Could not enable binary framing: {e}")
+    binary_mode = False
+    return False
+
+# GPIO setup using lgpio
+GPIO_CHIP = 0
+h = lgpio.gpiochip_open(GPIO_CHIP)
+
+# Shared serial-port helpers live one directory up in odor_core.py
+_CORE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "odor_core.py")
+_core_spec = importlib.util.spec_from_file_location("odor_core", _CORE_PATH)
+odor_core = importlib.util.module_from_spec(_core_spec)
+_core_spec.loader.exec_module(odor_core)
+scan_serial_ports = odor_core.scan_serial_ports
+fix_port_permissions = odor_core.fix_port_permissions
 
 def try_connect_port(port, retries=3):
     """Try to connect to a port with multiple retries"""
@@ -127,19 +102,21 @@ def try_connect_port(port, retries=3):
             ser.reset_input_buffer()
             ser.reset_output_buffer()
             
-            # Send test command multiple times
+            # Probe with the raw 3-byte handshake. The sketch answers 'T'
+            # with b'\xA5OK' while still streaming readings, so scan the
+            # next chunk of bytes for the reply instead of decoding lines
             for _ in range(3):
                 ser.write(b'T')  # Test command
-                time.sleep(0.1)
-                response = ser.readline().decode().strip()
+                probe = ser.read(32)
                 
-                if response == "READY":
+                if b'\xA5OK' in probe:
                     print(f"Arduino found on {port}")
                     return ser
                 
-                # If we get any data, this might be the right port but wrong mode
-                if response:
-                    print(f"Got response but not ready signal: {response}")
+                # Any data at all means an older sketch without the
+                # handshake is talking on this port
+                if probe:
+                    print(f"Got data but no handshake; assuming older sketch")
                     return ser
                 
             ser.close()
@@ -163,6 +140,15 @@ def connect_to_arduino():
         arduino_serial.close()
         arduino_serial = None
     
+    # Try the port that worked last time before paying for a full scan
+    last_port = odor_core.read_last_port()
+    if last_port:
+        print(f"Trying last-known port {last_port}...")
+        ser = try_connect_port(last_port)
+        if ser:
+            arduino_serial = ser
+            return True
+    
     # Scan for available ports
     ports = scan_serial_ports()
     
@@ -187,6 +173,7 @@ def connect_to_arduino():
         ser = try_connect_port(port)
         if ser:
             arduino_serial = ser
+            odor_core.remember_port(port)
             return True
     
     print("Could not find Arduino on any port")
@@ -199,22 +186,27 @@ def read_mq135(sensor_index=None):
         return None if sensor_index is not None else [None] * 4
     
     try:
-        # Send read command
-        arduino_serial.write(b'R')  # Read command
-        time.sleep(0.1)
-        
-        # Read response
-        response = arduino_serial.readline().decode().strip()
-        if not response:
-            raise Exception("No response from Arduino")
-        
-        # Parse values
-        values = [int(x) for x in response.split(',')]
-        if len(values) != 4:
-            raise Exception("Invalid data format")
-        
-        # Validate values
-        values = [v if 0 <= v <= 500 else None for v in values]
+        if binary_mode:
+            # Fixed-size frame: read() returns as soon as the bytes arrive,
+            # no decode/split and no fixed settle delay. The sketch already
+            # constrains each value to 0-500 before framing and the CRC
+            # rejects corruption, so no per-value range check is needed here
+            values = read_binary_frame()
+            if values is None:
+                raise Exception("No binary frame from Arduino")
+        else:
+            # ASCII fallback: Arduino streams CSV lines continuously, so
+            # readline() blocks only until the next line boundary
+            response = arduino_serial.readline().decode().strip()
+            if not response:
+                raise Exception("No response from Arduino")
+            
+            values = [int(x) for x in response.split(',')]
+            if len(values) != 4:
+                raise Exception("Invalid data format")
+            
+            # Validate values (text lines carry no checksum)
+            values = [v if 0 <= v <= 500 else None for v in values]
         
         if sensor_index is not None:
             return values[sensor_index]
@@ -262,6 +254,9 @@ def main():
     if not connect_to_arduino():
         print("Error: Could not connect to Arduino")
         return
+    
+    # Prefer the compact CRC-checked frames when the sketch supports them
+    enable_binary_frames()
         
     while True:
         print("\nMQ135 Test Sensor")
@@ -1,4 +1,5 @@
 import smbus2
+import struct
 import time
 
 # Prerequisites:
@@ -28,7 +29,7 @@ def scan_i2c():
     return detected
 
 def read_arduino():
-    """Read 1 byte from Arduino at address 8."""
+    """Read 1 byte from Arduino at address 8 (first byte of the sensor block)."""
     try:
         data = bus.read_byte(ARDUINO_ADDRESS)
         print(f"Read from address 0x{ARDUINO_ADDRESS:02X}: 0x{data:02X} ({data} decimal)")
@@ -37,6 +38,23 @@ def read_arduino():
         print(f"Error reading from address 0x{ARDUINO_ADDRESS:02X}: {e}")
         return None
 
+def read_all_sensors():
+    """Read all four sensor values in one I2C transaction.
+
+    A single 8-byte i2c_rdwr read costs one start/address/stop cycle on
+    the bus instead of four separate byte reads, so the whole sensor set
+    arrives in a quarter of the bus time."""
+    try:
+        msg = smbus2.i2c_msg.read(ARDUINO_ADDRESS, 8)
+        bus.i2c_rdwr(msg)
+        values = struct.unpack('<HHHH', bytes(msg))
+        print(f"Read from address 0x{ARDUINO_ADDRESS:02X}: "
+              f"GAS1={values[0]} GAS2={values[1]} GAS3={values[2]} GAS4={values[3]}")
+        return list(values)
+    except Exception as e:
+        print(f"Error reading sensor block from 0x{ARDUINO_ADDRESS:02X}: {e}")
+        return None
+
 def main():
     print("I2C Master Test Script")
     # Step 1: Scan for devices
@@ -54,6 +72,14 @@ def main():
             break
         time.sleep(1)
     
+    # Step 3: Read the full sensor set in a single transaction
+    print("\nTesting batched sensor read...")
+    for _ in range(3):  # Try 3 times
+        result = read_all_sensors()
+        if result is not None:
+            break
+        time.sleep(1)
+    
     print("\nTest complete. Check Arduino Serial Monitor for debug output.")
 
 if __name__ == "__main__":
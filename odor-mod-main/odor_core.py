@@ -0,0 +1,142 @@
+"""Shared serial-port helpers for the odor module and its test scripts.
+
+The main module, the draft, and the MQ135 test tool each carried their own
+copy of the port-scanning and permission-fixing code; this module is the
+single implementation. Callers pass their own `log` function (the main
+module uses its timestamped log_message, the test scripts plain print).
+"""
+import glob
+import grp
+import os
+import subprocess
+import time
+
+# Connection options shared by every module that talks to MongoDB. zstd and
+# snappy compress the repetitive field names in our documents on the wire
+# (pymongo silently skips compressors whose libraries are not installed),
+# and a small pool keeps connection creation predictable on the Pi. Write
+# concern and retryWrites stay as set in the connection URI.
+MONGO_CLIENT_OPTIONS = {
+    "compressors": "zstd,snappy,zlib",
+    "maxPoolSize": 4,
+    "serverSelectionTimeoutMS": 5000,
+}
+
+# The port the Arduino was last found on, remembered across runs so a
+# reconnect can skip the full scan
+LAST_PORT_FILE = os.path.expanduser("~/.odor_last_port")
+
+def read_last_port():
+    """Return the cached last-working port if it still exists, else None"""
+    try:
+        with open(LAST_PORT_FILE) as f:
+            port = f.read().strip()
+        if port and os.path.exists(port):
+            return port
+    except OSError:
+        pass
+    return None
+
+def remember_port(port):
+    """Persist the port a connection just succeeded on"""
+    try:
+        with open(LAST_PORT_FILE, 'w') as f:
+            f.write(port)
+    except OSError:
+        pass  # Cache is best-effort; next run just scans again
+
+def scan_serial_ports(log=print):
+    """Scan for available serial ports with fallback methods"""
+    log("Scanning serial ports...")
+
+    # Method 1: Try using glob (most reliable)
+    try:
+        # Common USB-Serial patterns
+        patterns = [
+            '/dev/ttyUSB*',
+            '/dev/ttyACM*',
+            '/dev/ttyAMA*',
+            'COM[0-9]*'  # For Windows
+        ]
+
+        ports = []
+        for pattern in patterns:
+            ports.extend(glob.glob(pattern))
+
+        if ports:
+            log(f"Found ports using glob: {', '.join(ports)}")
+            return ports
+    except Exception as e:
+        log(f"Glob scan error: {e}")
+
+    # Method 2: Try direct device check
+    try:
+        potential_ports = [
+            '/dev/ttyUSB0',
+            '/dev/ttyUSB1',
+            '/dev/ttyACM0',
+            '/dev/ttyACM1',
+            '/dev/ttyAMA0'
+        ]
+
+        ports = [port for port in potential_ports if os.path.exists(port)]
+        if ports:
+            log(f"Found ports using direct check: {', '.join(ports)}")
+            return ports
+    except Exception as e:
+        log(f"Direct check error: {e}")
+
+    log("No serial ports found using any method")
+    return []
+
+def _in_dialout_group(username):
+    """True if the user is already in dialout (so usermod would be a no-op)"""
+    try:
+        return username in grp.getgrnam('dialout').gr_mem
+    except KeyError:
+        return False
+
+def fix_port_permissions(port, log=print):
+    """Fix permission issues for serial ports (only where actually needed)"""
+    # Nothing to fix if the port is already readable and writable; every
+    # sudo call below costs a fork plus a policy check, so don't pay for
+    # them on a healthy port
+    if os.access(port, os.R_OK | os.W_OK):
+        return True
+
+    log(f"Fixing permissions for {port}...")
+
+    try:
+        # Kill any processes using the port
+        log("Killing processes using the port...")
+        subprocess.run(['sudo', 'fuser', '-k', port], capture_output=True, check=False)
+        time.sleep(1)
+
+        # Reset USB device
+        port_base = os.path.basename(port)
+        if 'USB' in port_base:
+            bus_device = subprocess.run(['readlink', '-f', port], capture_output=True, text=True, check=False).stdout.strip()
+            if bus_device:
+                usb_path = os.path.dirname(os.path.dirname(bus_device))
+                if os.path.exists(os.path.join(usb_path, 'authorized')):
+                    log("Resetting USB device...")
+                    subprocess.run(['sudo', 'sh', '-c', f'echo 0 > {usb_path}/authorized'], check=False)
+                    time.sleep(1)
+                    subprocess.run(['sudo', 'sh', '-c', f'echo 1 > {usb_path}/authorized'], check=False)
+                    time.sleep(2)
+
+        # Set permissions
+        log("Setting port permissions...")
+        subprocess.run(['sudo', 'chmod', '666', port], check=False)
+
+        # Add current user to dialout group, unless membership is already
+        # there (it only takes effect after re-login anyway)
+        username = os.getenv('USER', 'pi')
+        if not _in_dialout_group(username):
+            log(f"Adding user {username} to dialout group...")
+            subprocess.run(['sudo', 'usermod', '-a', '-G', 'dialout', username], check=False)
+
+        return True
+    except Exception as e:
+        log(f"Error fixing permissions: {e}")
+        return False
@@ -6,45 +6,38 @@ import time
 import signal
 import importlib
 import threading
+import queue
 from datetime import datetime
+from collections import deque
+from itertools import islice
 import platform
 
-# Add module paths to sys.path if not already included
+# Add module paths to sys.path if not already included, in one prepend so
+# our modules win over any same-named installs later on the path
 script_dir = os.path.dirname(os.path.abspath(__file__))
-for module_dir in ["disp-mod-main", "occupancy-mod-main", "odor-mod-main", "central-hub-mod"]:
-    module_path = os.path.join(script_dir, module_dir)
-    if module_path not in sys.path:
-        sys.path.append(module_path)
-
-# Try to import modules - handle import errors gracefully
-try:
-    from disp_mod_main import DispenserModule
-    DISPENSER_MODULE_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Could not import Dispenser Module: {e}")
-    DISPENSER_MODULE_AVAILABLE = False
-
-try:
-    from occu_mod_main import OccupancyModule
-    OCCUPANCY_MODULE_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Could not import Occupancy Module: {e}")
-    OCCUPANCY_MODULE_AVAILABLE = False
-    print("Occupancy module integration skipped - will be handled by main CLI.")
-
-try:
-    from odor_mod_main import OdorModule
-    ODOR_MODULE_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Could not import Odor Module: {e}")
-    ODOR_MODULE_AVAILABLE = False
-
-try:
-    from cen_mod_main import CentralHubModule
-    CENTRAL_HUB_MODULE_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Could not import Central Hub Module: {e}")
-    CENTRAL_HUB_MODULE_AVAILABLE = False
+module_paths = [
+    os.path.join(script_dir, module_dir)
+    for module_dir in ("disp-mod-main", "occupancy-mod-main", "odor-mod-main", "central-hub-mod")
+]
+sys.path[:0] = [path for path in module_paths if path not in sys.path]
+
+# Module registry: key, display label, import module, class name. Order
+# matters - initialization runs top to bottom and shutdown in reverse, and
+# adding a module is one line here instead of four copies of boilerplate
+MODULE_SPECS = [
+    ("dispenser", "Dispenser Module", "disp_mod_main", "DispenserModule"),
+    ("occupancy", "Occupancy Module", "occu_mod_main", "OccupancyModule"),
+    ("odor", "Odor Module", "odor_mod_main", "OdorModule"),
+    ("central_hub", "Central Hub Module", "cen_mod_main", "CentralHubModule"),
+]
+
+# Import whatever is present - missing modules just log a warning
+MODULE_CLASSES = {}
+for _key, _label, _mod_name, _cls_name in MODULE_SPECS:
+    try:
+        MODULE_CLASSES[_key] = getattr(importlib.import_module(_mod_name), _cls_name)
+    except ImportError as e:
+        print(f"Warning: Could not import {_label}: {e}")
 
 # Check if we're running on Raspberry Pi
 is_raspberry_pi = platform.machine().startswith('arm') or platform.machine().startswith('aarch')
@@ -56,47 +49,138 @@ MONITOR_INTERVAL = 5  # seconds
 
 # Debug handler to capture module logs
 class DebugHandler:
+    FLUSH_INTERVAL = 30  # Seconds between background flushes to disk
+
     def __init__(self, file_path=None, max_entries=100):
-        self.logs = []
+        # Bounded ring buffer: the deque evicts the oldest entry in C when
+        # full, so there is no slice-and-rebind under the lock
+        self.logs = deque(maxlen=max_entries)
         self.max_entries = max_entries
         self.lock = threading.Lock()
         self.file_path = file_path
-        
+        self._fh = None
+        # Timestamps only change once a second, so the rendered string is
+        # cached per second; a racing update just recomputes the same value
+        self._ts_sec = 0
+        self._ts_str = ""
+
         # Create directory for log file if specified
         if file_path:
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            # Clear existing log file
-            with open(file_path, 'w') as f:
-                f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Smart Restroom CLI Log Started\n")
-    
-    def log(self, message):
-        """Add a log message with timestamp"""
-        timestamp = datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
-        log_entry = f"{timestamp} {message}"
-        
-        with self.lock:
-            print(log_entry)
-            self.logs.append(log_entry)
-            
-            # Trim logs if they exceed max_entries
-            if len(self.logs) > self.max_entries:
-                self.logs = self.logs[-self.max_entries:]
-            
-            # Write to file if specified
-            if self.file_path:
+
+            # Truncate once and keep the handle open: one 64KB buffered
+            # writer for the whole run instead of an open/write/close
+            # syscall triple per message
+            self._fh = open(file_path, 'w', buffering=65536)
+            self._fh.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Smart Restroom CLI Log Started\n")
+            self._fh.flush()
+
+        # A single consumer thread owns stdout and the file handle; log()
+        # only enqueues, so callers return without waiting on any I/O even
+        # when three modules log at once
+        self._queue = queue.Queue(maxsize=10000)
+        self._consumer = threading.Thread(target=self._drain_loop, daemon=True)
+        self._consumer.start()
+
+    def _drain_loop(self):
+        """Consume queued lines and write them out in batches"""
+        while True:
+            try:
+                item = self._queue.get(timeout=self.FLUSH_INTERVAL)
+            except queue.Empty:
+                # Quiet stretch: push buffered lines to disk
+                if self._fh is not None:
+                    try:
+                        self._fh.flush()
+                    except Exception as e:
+                        print(f"Error flushing log file: {e}")
+                continue
+
+            # Drain whatever else is already queued so a burst costs one
+            # stdout write and one file write instead of one of each per line
+            batch = [item]
+            while len(batch) < 32:
                 try:
-                    with open(self.file_path, 'a') as f:
-                        f.write(log_entry + "\n")
-                except Exception as e:
-                    print(f"Error writing to log file: {e}")
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            lines = []
+            flush_now = False
+            for entry in batch:
+                if entry is None:  # Shutdown sentinel
+                    stop = True
+                    continue
+                line, error = entry
+                lines.append(line)
+                flush_now = flush_now or error
+
+            if lines:
+                # The consumer is the only writer of the ring, so the lock
+                # here only fences against get_recent_logs readers
+                with self.lock:
+                    self.logs.extend(lines)
+                text = "\n".join(lines) + "\n"
+                sys.stdout.write(text)
+                if self._fh is not None:
+                    try:
+                        self._fh.write(text)
+                        if flush_now:
+                            self._fh.flush()  # Errors must survive a crash
+                    except Exception as e:
+                        print(f"Error writing to log file: {e}")
+
+            if stop:
+                break
+
+    def log(self, message, error=False):
+        """Add a log message with timestamp"""
+        sec = int(time.time())
+        if sec != self._ts_sec:
+            self._ts_str = time.strftime("[%Y-%m-%d %H:%M:%S]", time.localtime(sec))
+            self._ts_sec = sec
+        log_entry = f"{self._ts_str} {message}"
+
+        # No lock on the producer path: the consumer thread appends to the
+        # ring when it drains the queue, so callers only pay the enqueue.
+        # If the queue somehow fills, drop the oldest pending line rather
+        # than block the caller
+        try:
+            self._queue.put_nowait((log_entry, error))
+        except queue.Full:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._queue.put_nowait((log_entry, error))
+
+    def close(self):
+        """Drain pending lines, then flush and close the log file"""
+        if self._consumer is not None:
+            self._queue.put(None)
+            self._consumer.join(timeout=2)
+            self._consumer = None
+        if self._fh is not None:
+            try:
+                self._fh.flush()
+                self._fh.close()
+            except Exception:
+                pass
+            self._fh = None
     
     def get_recent_logs(self, count=10):
         """Get the most recent log entries"""
         with self.lock:
-            return self.logs[-count:] if self.logs else []
+            tail = list(islice(reversed(self.logs), count))
+        tail.reverse()
+        return tail
 
 class SmartRestroomCLI:
+    # Container keys probed every interval, built once instead of four
+    # f-strings per refresh
+    CONTAINER_KEYS = ("CONT1", "CONT2", "CONT3", "CONT4")
+
     def __init__(self):
         """Initialize the Smart Restroom CLI"""
         # Create the debug handler for logging
@@ -106,7 +190,9 @@ class SmartRestroomCLI:
         # Create data directory if it doesn't exist
         os.makedirs(DATA_DIR, exist_ok=True)
         
-        # Module references
+        # Module references (the dict drives the lifecycle loops, the
+        # named attributes serve the format_* helpers)
+        self._modules = {}
         self.dispenser_module = None
         self.occupancy_module = None
         self.odor_module = None
@@ -115,75 +201,53 @@ class SmartRestroomCLI:
         # Control flags
         self.running = False
         self.stop_event = threading.Event()
+
+        # Cached status lines keyed by a tuple of the raw values they
+        # render; idle monitor intervals reuse the string instead of
+        # redoing the lookups and float formatting
+        self._dispenser_sig = None
+        self._dispenser_str = ""
+        self._occupancy_sig = None
+        self._occupancy_str = ""
+        self._odor_sig = None
+        self._odor_str = ""
         
     def initialize_modules(self):
         """Initialize all modules in the correct order"""
         self.debug_handler.log("Starting module initialization")
-        
+
         # Create data directory if it doesn't exist
         os.makedirs(DATA_DIR, exist_ok=True)
-        
-        # 1. Dispenser Module
-        if DISPENSER_MODULE_AVAILABLE:
-            try:
-                self.debug_handler.log("Initializing Dispenser Module...")
-                self.dispenser_module = DispenserModule()
-                if not self.dispenser_module.start():
-                    self.debug_handler.log("Failed to start Dispenser Module")
-                    return False
-                self.debug_handler.log("Dispenser Module initialized successfully")
-            except Exception as e:
-                self.debug_handler.log(f"Error initializing Dispenser Module: {e}")
-                return False
-        
-        # 2. Occupancy Module
-        if OCCUPANCY_MODULE_AVAILABLE:
-            try:
-                self.debug_handler.log("Initializing Occupancy Module...")
-                self.occupancy_module = OccupancyModule()
-                if not self.occupancy_module.start():
-                    self.debug_handler.log("Failed to start Occupancy Module")
-                    return False
-                self.debug_handler.log("Occupancy Module initialized successfully")
-            except Exception as e:
-                self.debug_handler.log(f"Error initializing Occupancy Module: {e}")
-                return False
-        
-        # 3. Odor Module
-        if ODOR_MODULE_AVAILABLE:
-            try:
-                self.debug_handler.log("Initializing Odor Module...")
-                self.odor_module = OdorModule()
-                if not self.odor_module.start():
-                    self.debug_handler.log("Failed to start Odor Module")
-                    return False
-                self.debug_handler.log("Odor Module initialized successfully")
-            except Exception as e:
-                self.debug_handler.log(f"Error initializing Odor Module: {e}")
-                return False
-        
-        # 4. Central Hub Module
-        if CENTRAL_HUB_MODULE_AVAILABLE:
+
+        for key, label, _mod_name, _cls_name in MODULE_SPECS:
+            module_class = MODULE_CLASSES.get(key)
+            if module_class is None:
+                continue
             try:
-                self.debug_handler.log("Initializing Central Hub Module...")
-                self.central_hub = CentralHubModule()
-                
-                # Register other modules with the central hub
-                if self.dispenser_module:
-                    self.central_hub.register_module("dispenser", self.dispenser_module)
-                if self.occupancy_module:
-                    self.central_hub.register_module("occupancy", self.occupancy_module)
-                if self.odor_module:
-                    self.central_hub.register_module("odor", self.odor_module)
-                
-                if not self.central_hub.start():
-                    self.debug_handler.log("Failed to start Central Hub Module")
+                self.debug_handler.log(f"Initializing {label}...")
+                instance = module_class()
+
+                # The hub comes last in the registry so every module that
+                # came up before it can be registered with it
+                if key == "central_hub":
+                    for other_key, other in self._modules.items():
+                        instance.register_module(other_key, other)
+
+                if not instance.start():
+                    self.debug_handler.log(f"Failed to start {label}", error=True)
                     return False
-                self.debug_handler.log("Central Hub Module initialized successfully")
+                self._modules[key] = instance
+                self.debug_handler.log(f"{label} initialized successfully")
             except Exception as e:
-                self.debug_handler.log(f"Error initializing Central Hub Module: {e}")
+                self.debug_handler.log(f"Error initializing {label}: {e}", error=True)
                 return False
-        
+
+        # Named references for the format_* helpers
+        self.dispenser_module = self._modules.get("dispenser")
+        self.occupancy_module = self._modules.get("occupancy")
+        self.odor_module = self._modules.get("odor")
+        self.central_hub = self._modules.get("central_hub")
+
         self.debug_handler.log("Module initialization completed")
         return True
     
@@ -192,35 +256,14 @@ class SmartRestroomCLI:
         self.debug_handler.log("=================")
         self.debug_handler.log("Module Status")
         self.debug_handler.log("=================")
-        
-        # Dispenser status
-        if self.dispenser_module:
-            status = self.dispenser_module.status()
-            self.debug_handler.log(f"Dispenser Module: {status}")
-        else:
-            self.debug_handler.log("Dispenser Module: Not available")
-        
-        # Occupancy status
-        if self.occupancy_module:
-            status = self.occupancy_module.status()
-            self.debug_handler.log(f"Occupancy Module: {status}")
-        else:
-            self.debug_handler.log("Occupancy Module: Not available")
-        
-        # Odor status
-        if self.odor_module:
-            status = self.odor_module.status()
-            self.debug_handler.log(f"Odor Module: {status}")
-        else:
-            self.debug_handler.log("Odor Module: Not available")
-        
-        # Central Hub status
-        if self.central_hub:
-            status = self.central_hub.status()
-            self.debug_handler.log(f"Central Hub Module: {status}")
-        else:
-            self.debug_handler.log("Central Hub Module: Not available")
-        
+
+        for key, label, _mod_name, _cls_name in MODULE_SPECS:
+            instance = self._modules.get(key)
+            if instance:
+                self.debug_handler.log(f"{label}: {instance.status()}")
+            else:
+                self.debug_handler.log(f"{label}: Not available")
+
         self.debug_handler.log("=================")
     
     def format_dispenser_data(self):
@@ -230,18 +273,30 @@ class SmartRestroomCLI:
         
         try:
             container_data = self.dispenser_module.get_container_summary()
-            parts = []
-            
-            for i in range(1, 5):
-                container = f"CONT{i}"
+            rows = []
+
+            for container in self.CONTAINER_KEYS:
                 if container in container_data:
                     data = container_data[container]
-                    distance = data.get("distance_cm", 0)
-                    volume = data.get("remaining_volume_ml", 0)
-                    percentage = int((volume / 1000) * 100) if volume else 0  # Assuming 1000ml is full
-                    parts.append(f"{container}: {distance:.2f} cm {volume:.2f} ml {percentage}%")
-            
-            return "Dispenser Module | " + " | ".join(parts)
+                    rows.append((container,
+                                 data.get("distance_cm", 0),
+                                 data.get("remaining_volume_ml", 0)))
+
+            # Unchanged readings render to the same string; skip the work
+            sig = tuple(rows)
+            if sig == self._dispenser_sig:
+                return self._dispenser_str
+
+            parts = []
+            for container, distance, volume in rows:
+                # volume * 0.1 == (volume / 1000) * 100, minus a division;
+                # 1000 ml is a full container
+                percentage = int(volume * 0.1) if volume else 0
+                parts.append(f"{container}: {distance:.2f} cm {volume:.2f} ml {percentage}%")
+
+            self._dispenser_sig = sig
+            self._dispenser_str = "Dispenser Module | " + " | ".join(parts)
+            return self._dispenser_str
         except Exception as e:
             return f"Dispenser Module: Error formatting data ({e})"
     
@@ -253,14 +308,19 @@ class SmartRestroomCLI:
         try:
             cubicle_data = self.occupancy_module.get_cubicle_summary()
             occupied_count = 0
-            
+
             for i in range(1, 4):
                 cubicle = f"CUB{i}"
                 if cubicle in cubicle_data and cubicle_data[cubicle]["status"] == "OCCUPIED":
                     occupied_count += 1
-            
+
+            if occupied_count == self._occupancy_sig:
+                return self._occupancy_str
+
             presence = "Occupied" if occupied_count > 0 else "Vacant"
-            return f"Occupancy Module | Number of Occupied: {occupied_count} | Presence: {presence}"
+            self._occupancy_sig = occupied_count
+            self._occupancy_str = f"Occupancy Module | Number of Occupied: {occupied_count} | Presence: {presence}"
+            return self._occupancy_str
         except Exception as e:
             return f"Occupancy Module: Error formatting data ({e})"
     
@@ -271,12 +331,17 @@ class SmartRestroomCLI:
         
         try:
             sensor_data = self.odor_module.get_sensor_summary()
-            value = sensor_data.get("value", 0)
-            status = sensor_data.get("status", "UNKNOWN")
-            fan_state = sensor_data.get("fan_state", "OFF")
-            occupancy = sensor_data.get("occupancy", "VACANT")
-            
-            return f"Odor Module | AQI: {value} | Air Quality: {status} | Fan: {fan_state} | Occupancy: {occupancy}"
+            sig = (sensor_data.get("value", 0),
+                   sensor_data.get("status", "UNKNOWN"),
+                   sensor_data.get("fan_state", "OFF"),
+                   sensor_data.get("occupancy", "VACANT"))
+            if sig == self._odor_sig:
+                return self._odor_str
+
+            value, status, fan_state, occupancy = sig
+            self._odor_sig = sig
+            self._odor_str = f"Odor Module | AQI: {value} | Air Quality: {status} | Fan: {fan_state} | Occupancy: {occupancy}"
+            return self._odor_str
         except Exception as e:
             return f"Odor Module: Error formatting data ({e})"
     
@@ -316,13 +381,14 @@ class SmartRestroomCLI:
         # Main monitoring loop
         self.debug_handler.log("Starting to log and monitor all of the data")
         try:
-            while self.running and not self.stop_event.is_set():
-                # Print status update
+            # stop_event.wait both paces the loop and returns True the
+            # moment stop() fires, so shutdown is immediate instead of up
+            # to MONITOR_INTERVAL late and the thread never wakes just to
+            # re-check a flag
+            self.print_status_update()
+            while self.running and not self.stop_event.wait(MONITOR_INTERVAL):
                 self.print_status_update()
-                
-                # Sleep for the monitoring interval
-                time.sleep(MONITOR_INTERVAL)
-        
+
         except KeyboardInterrupt:
             self.debug_handler.log("Keyboard interrupt received, shutting down...")
         
@@ -332,44 +398,33 @@ class SmartRestroomCLI:
     def stop(self):
         """Stop all modules and exit"""
         self.running = False
+        self.stop_event.set()
         self.debug_handler.log("Shutting down Smart Restroom CLI...")
         
-        # Stop modules in reverse order
-        if self.central_hub:
-            try:
-                self.central_hub.stop()
-                self.debug_handler.log("Central Hub Module stopped")
-            except Exception as e:
-                self.debug_handler.log(f"Error stopping Central Hub Module: {e}")
-        
-        if self.odor_module:
-            try:
-                self.odor_module.stop()
-                self.debug_handler.log("Odor Module stopped")
-            except Exception as e:
-                self.debug_handler.log(f"Error stopping Odor Module: {e}")
-        
-        if self.occupancy_module:
+        # Stop modules in reverse initialization order
+        for key, label, _mod_name, _cls_name in reversed(MODULE_SPECS):
+            instance = self._modules.get(key)
+            if not instance:
+                continue
             try:
-                self.occupancy_module.stop()
-                self.debug_handler.log("Occupancy Module stopped")
+                instance.stop()
+                self.debug_handler.log(f"{label} stopped")
             except Exception as e:
-                self.debug_handler.log(f"Error stopping Occupancy Module: {e}")
-        
-        if self.dispenser_module:
-            try:
-                self.dispenser_module.stop()
-                self.debug_handler.log("Dispenser Module stopped")
-            except Exception as e:
-                self.debug_handler.log(f"Error stopping Dispenser Module: {e}")
-        
+                self.debug_handler.log(f"Error stopping {label}: {e}", error=True)
+
+
         self.debug_handler.log("Smart Restroom CLI shutdown complete")
+        self.debug_handler.close()
 
 def signal_handler(sig, frame):
-    """Handle Ctrl+C gracefully"""
+    """Handle Ctrl+C/SIGTERM by signaling shutdown"""
+    # Only set the event: the monitor loop's wait returns immediately and
+    # start()'s finally block performs the one orderly stop(). Calling
+    # stop() plus sys.exit here raced that teardown against interpreter
+    # shutdown
     if cli:
-        cli.stop()
-    sys.exit(0)
+        cli.running = False
+        cli.stop_event.set()
 
 if __name__ == "__main__":
     # Register signal handlers
